@@ -1,25 +1,62 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import json
+import types
 from datetime import datetime
+from typing import Dict, Tuple
 from storage import CarbonFootprintStorage
 import os
 
-# Initialize storage
-storage = CarbonFootprintStorage()
+# Initialize storage, shared by all sessions in this server process
+@st.cache_resource
+def get_storage():
+    """Get the shared CarbonFootprintStorage instance; it locks internally, so threads can share it."""
+    return CarbonFootprintStorage()
+
+storage = get_storage()
+
+def _storage_cache_key(storage):
+    """Identify the storage contents by file state and write count."""
+    try:
+        stat = os.stat(storage.storage_file)
+    except FileNotFoundError:
+        # Not created yet; storage makes it on first read
+        return (storage.storage_file, None, None, storage.version)
+    return (storage.storage_file, stat.st_mtime_ns, stat.st_size, storage.version)
+
+# Every save makes the cached history-derived entries stale, so only keep a
+# few around for sessions still showing an older history
+HISTORY_CACHE_ENTRIES = 8
+
+# Cached reads, so reruns only stat the history file instead of parsing it
+@st.cache_data(hash_funcs={CarbonFootprintStorage: _storage_cache_key}, max_entries=HISTORY_CACHE_ENTRIES)
+def get_cached_calculations(storage):
+    """Get calculation history, most recent first."""
+    return storage.get_calculations()
+
+@st.cache_data(hash_funcs={CarbonFootprintStorage: _storage_cache_key}, max_entries=HISTORY_CACHE_ENTRIES)
+def get_cached_stats(storage):
+    """Get statistics over the calculation history."""
+    return storage.get_statistics()
 
 # Load emission factors from JSON
-@st.cache_data
+@st.cache_resource
 def load_emission_factors():
-    """Load emission factors from JSON file."""
+    """
+    Load emission factors from JSON file.
+
+    The result is a single instance shared across sessions and reruns, so
+    callers must treat it (including the nested dicts) as read-only.
+    """
     try:
         with open('emission_factors.json', 'r') as f:
-            return json.load(f)
+            return types.MappingProxyType(json.load(f))
     except FileNotFoundError:
         st.error("⚠️ emission_factors.json not found!")
-        return {}
+        return types.MappingProxyType({})
 
 EMISSION_FACTORS = load_emission_factors()
 
@@ -35,35 +72,299 @@ BADGES = {
     "recycler": {"icon": "♻️", "title": "Recycling Pro", "description": "70%+ recycling rate"}
 }
 
+ECO_TRANSPORT = frozenset({"Bicycle/Walk", "Metro/Train", "Electric Vehicle"})
+VEG_DIETS = frozenset({"Vegetarian", "Vegan"})
+
 def check_badges(calc_data, stats):
     """Check which badges user has earned."""
-    earned = []
-    
-    if stats["total_calculations"] >= 1:
-        earned.append("first_calculation")
-    
-    if calc_data.get("total_emissions", 999) < 3:
-        earned.append("under_3_tonnes")
-    
-    if calc_data.get("total_emissions", 999) < 2:
-        earned.append("under_2_tonnes")
+    total_calculations = stats["total_calculations"]
+    total_emissions = calc_data.get("total_emissions", 999)
+    
+    predicates = (
+        ("first_calculation", total_calculations >= 1),
+        ("under_3_tonnes", total_emissions < 3),
+        ("under_2_tonnes", total_emissions < 2),
+        ("10_calculations", total_calculations >= 10),
+        ("improving_trend", stats.get("trend") == "improving"),
+        ("transport_optimizer", calc_data.get("transport_mode") in ECO_TRANSPORT),
+        ("vegetarian", calc_data.get("diet_type") in VEG_DIETS),
+        ("recycler", calc_data.get("recycling_pct", 0) >= 70)
+    )
+    return [badge_id for badge_id, ok in predicates if ok]
+
+@st.cache_data
+def compute_scenarios(country: str) -> Tuple[Dict, Dict]:
+    """
+    Calculate the fixed high and low carbon scenarios for a country.
+
+    Returns:
+        (high, low) dicts with transport, electricity, diet, waste and
+        total emissions in tonnes CO2e
+    """
+    factors = EMISSION_FACTORS[country]
+    transport = factors["Transportation"]
+    diet = factors["Diet"]
+    
+    # High carbon: 50km petrol car commute, 300 kWh/month, high meat diet,
+    # 10kg waste/week with 20% recycling
+    high = {
+        "transport": transport.get("Car (Petrol)", 0.192) * 50 * 2 * 260 / 1000,
+        "electricity": factors["Electricity"] * 300 * 12 / 1000,
+        "diet": diet.get("High Meat Eater", 3300) / 1000,
+        "waste": factors["Waste"] * 10 * 52 * 0.8 / 1000
+    }
+    # Low carbon: 10km metro commute, 80 kWh/month, vegetarian diet,
+    # 3kg waste/week with 80% recycling
+    low = {
+        "transport": transport.get("Metro/Train", 0.035) * 10 * 2 * 260 / 1000,
+        "electricity": factors["Electricity"] * 80 * 12 / 1000,
+        "diet": diet.get("Vegetarian", 1700) / 1000,
+        "waste": factors["Waste"] * 3 * 52 * 0.2 / 1000
+    }
+    for scenario in (high, low):
+        scenario["total"] = round(sum(scenario.values()), 2)
+    return high, low
+
+# History charts are downsampled to about this many points; the browser
+# can't resolve more than its pixel width anyway
+MAX_PLOT_POINTS = 1024
+
+def lttb_indices(values, threshold):
+    """
+    Pick row positions that preserve the visual shape of a series.
+
+    Uses Largest-Triangle-Three-Buckets downsampling with the row position
+    as x. The first and last rows are always kept.
+
+    Args:
+        values: Sequence of numeric y values
+        threshold: Maximum number of positions to return
+
+    Returns:
+        Sorted list of row positions into values
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    bucket_size = (n - 2) / (threshold - 2)
+    selected = [0]
+    prev = 0
+    for i in range(threshold - 2):
+        # Average point of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+
+        # Keep the point in this bucket forming the largest triangle
+        best, best_area = None, -1.0
+        for j in range(int(i * bucket_size) + 1, next_start):
+            area = abs((prev - avg_x) * (values[j] - values[prev]) - (prev - j) * (avg_y - values[prev]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        prev = best
+
+    selected.append(n - 1)
+    return selected
+
+@st.cache_data(max_entries=HISTORY_CACHE_ENTRIES)
+def prepare_history_df(history_key, _calculations):
+    """Build the date-sorted history DataFrame; see build_timeline for history_key."""
+    df_history = pd.DataFrame(_calculations)
+    df_history['date'] = pd.to_datetime(df_history['timestamp']).dt.date
+    return df_history.sort_values('date')
+
+@st.cache_data(max_entries=HISTORY_CACHE_ENTRIES)
+def downsample_history(history_key, _df_history):
+    """Keep at most MAX_PLOT_POINTS rows for the charts; see build_timeline for history_key."""
+    return _df_history.iloc[lttb_indices(_df_history['total_emissions'].tolist(), MAX_PLOT_POINTS)]
+
+@st.cache_data(max_entries=HISTORY_CACHE_ENTRIES)
+def build_timeline(history_key, goal_target, _df_history):
+    """
+    Build the total emissions timeline figure.
+
+    history_key identifies the history contents (count, latest timestamp)
+    and stands in for _df_history, which Streamlit doesn't hash.
+    """
+    fig_timeline = go.Figure(
+        data=[go.Scattergl(
+            x=_df_history['date'],
+            y=_df_history['total_emissions'],
+            mode='lines+markers',
+            name='Total Emissions',
+            line=dict(color='#2E8B57', width=3),
+            marker=dict(size=8)
+        )],
+        layout=go.Layout(
+            title="Carbon Footprint Timeline",
+            xaxis_title="Date",
+            yaxis_title="Emissions (tonnes CO₂e)",
+            hovermode='x unified'
+        )
+    )
+
+    # Add goal line if exists
+    if goal_target is not None:
+        fig_timeline.add_hline(
+            y=goal_target,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Goal: {goal_target} tonnes"
+        )
+    return fig_timeline
+
+@st.cache_data(max_entries=HISTORY_CACHE_ENTRIES)
+def build_category_trends(history_key, _df_history):
+    """Build the stacked per-category emissions figure; see build_timeline."""
+    # Scattergl has no stackgroup, so stack by hand: each trace plots the
+    # running total and fills down to the previous one, while hover shows
+    # the category's own value
+    traces = []
+    stacked = 0
+    for column, name, color in (
+        ('transportation', 'Transportation', '#2E8B57'),
+        ('electricity', 'Electricity', '#32CD32'),
+        ('diet', 'Diet', '#90EE90'),
+        ('waste', 'Waste', '#98FB98')
+    ):
+        stacked = stacked + _df_history[column]
+        traces.append(go.Scattergl(
+            x=_df_history['date'],
+            y=stacked,
+            customdata=_df_history[column],
+            hovertemplate='%{customdata}',
+            name=name,
+            mode='lines',
+            fill='tozeroy' if column == 'transportation' else 'tonexty',
+            fillcolor=color
+        ))
+
+    fig_categories = go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title="Emissions by Category Over Time",
+            xaxis_title="Date",
+            yaxis_title="Emissions (tonnes CO₂e)",
+            hovermode='x unified'
+        )
+    )
+    return fig_categories
+
+@st.cache_data(max_entries=HISTORY_CACHE_ENTRIES)
+def history_csv(history_key, _display_df):
+    """Serialize the history table to CSV; see build_timeline for history_key."""
+    return _display_df.to_csv(index=False)
+
+# Emission multipliers for the simulator's transport (bike 2 days, carpool,
+# public transport) and energy (LED bulbs, solar, appliances) actions
+TRANSPORT_ACTION_FACTORS = np.array([0.8, 0.7, 0.4])
+ENERGY_ACTION_FACTORS = np.array([0.85, 0.5, 0.8])
+
+@st.fragment
+def action_simulator(transportation_emissions, electricity_emissions, diet_emissions, waste_emissions,
+                     total_emissions, country, diet_type, yearly_waste, diet_keys, diet_index):
+    """
+    Render the Action Simulator for a calculated footprint.
+
+    Runs as a fragment, so toggling an action only reruns this function
+    instead of the whole script.
+    """
+    country_factors = EMISSION_FACTORS[country]
+    diet_factors = country_factors["Diet"]
+    
+    st.markdown('<h2 class="section-header">🎮 Action Simulator</h2>', unsafe_allow_html=True)
+    st.markdown("See how different actions would impact your footprint:")
+    
+    sim_col1, sim_col2 = st.columns(2)
+    
+    with sim_col1:
+        st.markdown("**🚗 Transportation Actions:**")
+        action_bike_2days = st.checkbox("Bike/walk 2 days per week (20% reduction)")
+        action_carpool = st.checkbox("Carpool 3 days per week (30% reduction)")
+        action_public_transport = st.checkbox("Switch to public transport (60% reduction)")
+        
+        st.markdown("**💡 Energy Actions:**")
+        action_led_bulbs = st.checkbox("Switch to LED bulbs (15% reduction)")
+        action_solar = st.checkbox("Install solar panels (50% reduction)")
+        action_appliances = st.checkbox("Energy-efficient appliances (20% reduction)")
+    
+    with sim_col2:
+        st.markdown("**🍽️ Diet Actions:**")
+        action_reduce_meat = st.checkbox("Reduce meat by 50%")
+        action_vegetarian = st.checkbox("Go vegetarian")
+        action_local_food = st.checkbox("Buy local food (10% reduction)")
+        
+        st.markdown("**🗑️ Waste Actions:**")
+        action_compost = st.checkbox("Start composting (30% reduction)")
+        action_recycle_more = st.checkbox("Increase recycling to 80%")
+        action_reduce_waste = st.checkbox("Reduce waste by 25%")
+    
+    # Calculate simulated emissions
+    sim_transport = transportation_emissions
+    sim_electricity = electricity_emissions
+    sim_diet = diet_emissions
+    sim_waste = waste_emissions
+    
+    transport_flags = np.array([action_bike_2days, action_carpool, action_public_transport])
+    sim_transport *= float(np.prod(np.where(transport_flags, TRANSPORT_ACTION_FACTORS, 1.0)))
+    
+    energy_flags = np.array([action_led_bulbs, action_solar, action_appliances])
+    sim_electricity *= float(np.prod(np.where(energy_flags, ENERGY_ACTION_FACTORS, 1.0)))
+    
+    if action_reduce_meat:
+        current_diet_index = diet_index[diet_type]
+        if current_diet_index > 0:
+            sim_diet = diet_factors[diet_keys[current_diet_index - 1]] / 1000
+    if action_vegetarian:
+        sim_diet = diet_factors["Vegetarian"] / 1000
+    if action_local_food:
+        sim_diet *= 0.9
+    
+    if action_compost:
+        sim_waste *= 0.7
+    if action_recycle_more:
+        new_unrecycled = yearly_waste * 0.2
+        sim_waste = (country_factors["Waste"] * new_unrecycled) / 1000
+    if action_reduce_waste:
+        sim_waste *= 0.75
+    
+    simulated_total = round(sim_transport + sim_electricity + sim_diet + sim_waste, 2)
+    savings = round(total_emissions - simulated_total, 2)
+    savings_pct = round((savings / total_emissions) * 100, 1) if total_emissions > 0 else 0
     
-    if stats["total_calculations"] >= 10:
-        earned.append("10_calculations")
+    st.markdown("---")
+    st.markdown('<h4 class="section-header">🎯 Simulated Impact</h4>', unsafe_allow_html=True)
     
-    if stats.get("trend") == "improving":
-        earned.append("improving_trend")
+    sim_res_col1, sim_res_col2, sim_res_col3 = st.columns(3)
     
-    if calc_data.get("transport_mode") in ["Bicycle/Walk", "Metro/Train", "Electric Vehicle"]:
-        earned.append("transport_optimizer")
+    with sim_res_col1:
+        st.metric("Current Footprint", f"{total_emissions} tonnes")
     
-    if calc_data.get("diet_type") in ["Vegetarian", "Vegan"]:
-        earned.append("vegetarian")
+    with sim_res_col2:
+        st.metric("Simulated Footprint", f"{simulated_total} tonnes", delta=f"-{savings} tonnes")
     
-    if calc_data.get("recycling_pct", 0) >= 70:
-        earned.append("recycler")
+    with sim_res_col3:
+        st.metric("Potential Savings", f"{savings_pct}%", delta=f"{savings} tonnes saved")
     
-    return earned
+    # Savings visualization
+    if savings > 0:
+        comparison_df = pd.DataFrame({
+            "Scenario": ["Current", "With Actions"],
+            "Emissions": [total_emissions, simulated_total]
+        })
+        
+        fig_comparison = px.bar(
+            comparison_df,
+            x="Scenario",
+            y="Emissions",
+            color="Scenario",
+            title="Current vs Optimized Emissions",
+            color_discrete_sequence=['#FF6B6B', '#4ECDC4']
+        )
+        st.plotly_chart(fig_comparison, use_container_width=True)
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -73,7 +374,7 @@ st.set_page_config(
 )
 
 # --- CUSTOM STYLING ---
-st.markdown("""
+_BASE_CSS = """
 <style>
     .main-header {
         color: #2E8B57;
@@ -125,7 +426,33 @@ st.markdown("""
     footer {visibility: hidden;}
     header {visibility: hidden;}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Theme name -> accent color used by the sidebar theme selector
+_COLOR_MAP = {
+    "Green (Default)": "#2E8B57",
+    "Blue": "#4682B4",
+    "Purple": "#663399",
+    "Orange": "#FF8C00"
+}
+
+# Stylesheet overriding the default green accent; format with c=<color>
+_THEME_CSS_TMPL = """
+<style>
+    .main-header, .section-header {{ color: {c} !important; }}
+    .stButton > button {{ background: linear-gradient(45deg, {c}, {c}99) !important; }}
+    .metric-card {{ border-left-color: {c} !important; }}
+</style>
+"""
+
+# Fully formatted theme overrides; the default green theme needs none
+_THEME_CSS = {
+    name: _THEME_CSS_TMPL.format(c=color)
+    for name, color in _COLOR_MAP.items()
+    if name != "Green (Default)"
+}
+
+st.markdown(_BASE_CSS, unsafe_allow_html=True)
 
 # --- SIDEBAR ---
 with st.sidebar:
@@ -134,31 +461,18 @@ with st.sidebar:
     # Theme selector
     theme_color = st.selectbox(
         "🎨 Theme Color",
-        ["Green (Default)", "Blue", "Purple", "Orange"],
+        list(_COLOR_MAP),
         help="Select your preferred color theme"
     )
     
-    color_map = {
-        "Green (Default)": "#2E8B57",
-        "Blue": "#4682B4", 
-        "Purple": "#663399",
-        "Orange": "#FF8C00"
-    }
-    
-    if theme_color != "Green (Default)":
-        selected_color = color_map[theme_color]
-        st.markdown(f"""
-        <style>
-            .main-header, .section-header {{ color: {selected_color} !important; }}
-            .stButton > button {{ background: linear-gradient(45deg, {selected_color}, {selected_color}99) !important; }}
-            .metric-card {{ border-left-color: {selected_color} !important; }}
-        </style>
-        """, unsafe_allow_html=True)
+    theme_css = _THEME_CSS.get(theme_color)
+    if theme_css:
+        st.markdown(theme_css, unsafe_allow_html=True)
     
     st.markdown("---")
     
     # Statistics
-    stats = storage.get_statistics()
+    stats = get_cached_stats(storage)
     st.markdown('<h4 class="section-header">📊 Your Stats</h4>', unsafe_allow_html=True)
     st.metric("Total Calculations", stats["total_calculations"])
     if stats["total_calculations"] > 0:
@@ -213,6 +527,11 @@ with main_tab1:
     # Location
     st.markdown('<h3 class="section-header">🌍 Your Location</h3>', unsafe_allow_html=True)
     country = st.selectbox("Select your country", list(EMISSION_FACTORS.keys()), help="Emission factors vary by region")
+    country_factors = EMISSION_FACTORS[country]
+    transport_factors = country_factors["Transportation"]
+    diet_factors = country_factors["Diet"]
+    diet_keys = list(diet_factors)
+    diet_index = {key: i for i, key in enumerate(diet_keys)}
     
     st.divider()
     
@@ -226,7 +545,7 @@ with main_tab1:
             st.markdown('<h4 class="section-header">🚗 Transportation</h4>', unsafe_allow_html=True)
             transport_mode = st.selectbox(
                 "Primary mode of daily commute:",
-                options=list(EMISSION_FACTORS[country]["Transportation"].keys()),
+                options=list(transport_factors.keys()),
                 help="Choose your most frequently used mode"
             )
             distance = st.number_input(
@@ -260,10 +579,10 @@ with main_tab1:
             st.markdown('<h4 class="section-header">🍽️ Diet</h4>', unsafe_allow_html=True)
             diet_type = st.selectbox(
                 "Describe your diet:",
-                options=list(EMISSION_FACTORS[country]["Diet"].keys())
+                options=diet_keys
             )
             
-            diet_impact = EMISSION_FACTORS[country]["Diet"][diet_type]
+            diet_impact = diet_factors[diet_type]
             st.info(f"💡 Diet contributes ~{diet_impact/1000:.1f} tonnes CO₂e annually")
         
         with col2:
@@ -298,28 +617,31 @@ with main_tab1:
     if calculate_button:
         # Calculations
         yearly_distance = distance * 2 * 260
-        transportation_emissions = (EMISSION_FACTORS[country]["Transportation"][transport_mode] * yearly_distance) / 1000
+        transportation_emissions = (transport_factors[transport_mode] * yearly_distance) / 1000
         
         yearly_electricity = electricity * 12
-        electricity_emissions = (EMISSION_FACTORS[country]["Electricity"] * yearly_electricity) / 1000
+        electricity_emissions = (country_factors["Electricity"] * yearly_electricity) / 1000
         
-        diet_emissions = EMISSION_FACTORS[country]["Diet"][diet_type] / 1000
+        diet_emissions = diet_factors[diet_type] / 1000
         
         yearly_waste = waste * 52
         unrecycled_waste = yearly_waste * (1 - recycling_pct / 100)
-        waste_emissions = (EMISSION_FACTORS[country]["Waste"] * unrecycled_waste) / 1000
+        waste_emissions = (country_factors["Waste"] * unrecycled_waste) / 1000
         
         total_emissions = round(transportation_emissions + electricity_emissions + diet_emissions + waste_emissions, 2)
         
         # Save calculation
+        rounded_transport, rounded_electricity, rounded_diet, rounded_waste = np.round(np.array([
+            transportation_emissions, electricity_emissions, diet_emissions, waste_emissions
+        ]), 2).tolist()
         calc_data = {
             "timestamp": datetime.now().isoformat(),
             "country": country,
             "total_emissions": total_emissions,
-            "transportation": round(transportation_emissions, 2),
-            "electricity": round(electricity_emissions, 2),
-            "diet": round(diet_emissions, 2),
-            "waste": round(waste_emissions, 2),
+            "transportation": rounded_transport,
+            "electricity": rounded_electricity,
+            "diet": rounded_diet,
+            "waste": rounded_waste,
             "transport_mode": transport_mode,
             "daily_distance": distance,
             "monthly_electricity": electricity,
@@ -402,142 +724,38 @@ with main_tab1:
         
         with res_col1:
             st.markdown('<h4 class="section-header">📋 Detailed Breakdown</h4>', unsafe_allow_html=True)
-            emissions_data = {
+            values = np.array([transportation_emissions, electricity_emissions, diet_emissions, waste_emissions])
+            emissions_df = pd.DataFrame({
                 "Category": ["🚗 Transportation", "💡 Electricity", "🍽️ Diet", "🗑️ Waste"],
-                "Emissions (tonnes)": [
-                    round(transportation_emissions, 2),
-                    round(electricity_emissions, 2),
-                    round(diet_emissions, 2),
-                    round(waste_emissions, 2)
-                ],
-                "Percentage": [
-                    f"{round((transportation_emissions/total_emissions)*100, 1)}%",
-                    f"{round((electricity_emissions/total_emissions)*100, 1)}%",
-                    f"{round((diet_emissions/total_emissions)*100, 1)}%",
-                    f"{round((waste_emissions/total_emissions)*100, 1)}%"
-                ]
-            }
-            emissions_df = pd.DataFrame(emissions_data)
+                "Emissions (tonnes)": np.round(values, 2),
+                "Percentage": [f"{p}%" for p in np.round(values / total_emissions * 100, 1)]
+            })
             st.dataframe(emissions_df, use_container_width=True, hide_index=True)
         
         with res_col2:
             st.markdown('<h4 class="section-header">📊 Distribution</h4>', unsafe_allow_html=True)
-            fig = px.pie(
-                emissions_df,
-                values='Emissions (tonnes)',
-                names='Category',
+            fig = go.Figure(go.Pie(
+                labels=emissions_df["Category"],
+                values=emissions_df["Emissions (tonnes)"],
                 hole=.4,
-                color_discrete_sequence=['#2E8B57', '#32CD32', '#90EE90', '#98FB98']
-            )
-            fig.update_traces(textposition='inside', textinfo='percent+label')
+                marker=dict(colors=['#2E8B57', '#32CD32', '#90EE90', '#98FB98']),
+                textposition='inside',
+                textinfo='percent+label'
+            ))
             st.plotly_chart(fig, use_container_width=True)
         
         st.divider()
         
         # Action Simulator
-        st.markdown('<h2 class="section-header">🎮 Action Simulator</h2>', unsafe_allow_html=True)
-        st.markdown("See how different actions would impact your footprint:")
-        
-        sim_col1, sim_col2 = st.columns(2)
-        
-        with sim_col1:
-            st.markdown("**🚗 Transportation Actions:**")
-            action_bike_2days = st.checkbox("Bike/walk 2 days per week (20% reduction)")
-            action_carpool = st.checkbox("Carpool 3 days per week (30% reduction)")
-            action_public_transport = st.checkbox("Switch to public transport (60% reduction)")
-            
-            st.markdown("**💡 Energy Actions:**")
-            action_led_bulbs = st.checkbox("Switch to LED bulbs (15% reduction)")
-            action_solar = st.checkbox("Install solar panels (50% reduction)")
-            action_appliances = st.checkbox("Energy-efficient appliances (20% reduction)")
-        
-        with sim_col2:
-            st.markdown("**🍽️ Diet Actions:**")
-            action_reduce_meat = st.checkbox("Reduce meat by 50%")
-            action_vegetarian = st.checkbox("Go vegetarian")
-            action_local_food = st.checkbox("Buy local food (10% reduction)")
-            
-            st.markdown("**🗑️ Waste Actions:**")
-            action_compost = st.checkbox("Start composting (30% reduction)")
-            action_recycle_more = st.checkbox("Increase recycling to 80%")
-            action_reduce_waste = st.checkbox("Reduce waste by 25%")
-        
-        # Calculate simulated emissions
-        sim_transport = transportation_emissions
-        sim_electricity = electricity_emissions
-        sim_diet = diet_emissions
-        sim_waste = waste_emissions
-        
-        if action_bike_2days:
-            sim_transport *= 0.8
-        if action_carpool:
-            sim_transport *= 0.7
-        if action_public_transport:
-            sim_transport *= 0.4
-        
-        if action_led_bulbs:
-            sim_electricity *= 0.85
-        if action_solar:
-            sim_electricity *= 0.5
-        if action_appliances:
-            sim_electricity *= 0.8
-        
-        if action_reduce_meat:
-            current_diet_index = list(EMISSION_FACTORS[country]["Diet"].keys()).index(diet_type)
-            if current_diet_index > 0:
-                sim_diet = EMISSION_FACTORS[country]["Diet"][list(EMISSION_FACTORS[country]["Diet"].keys())[current_diet_index - 1]] / 1000
-        if action_vegetarian:
-            sim_diet = EMISSION_FACTORS[country]["Diet"]["Vegetarian"] / 1000
-        if action_local_food:
-            sim_diet *= 0.9
-        
-        if action_compost:
-            sim_waste *= 0.7
-        if action_recycle_more:
-            new_unrecycled = yearly_waste * 0.2
-            sim_waste = (EMISSION_FACTORS[country]["Waste"] * new_unrecycled) / 1000
-        if action_reduce_waste:
-            sim_waste *= 0.75
-        
-        simulated_total = round(sim_transport + sim_electricity + sim_diet + sim_waste, 2)
-        savings = round(total_emissions - simulated_total, 2)
-        savings_pct = round((savings / total_emissions) * 100, 1) if total_emissions > 0 else 0
-        
-        st.markdown("---")
-        st.markdown('<h4 class="section-header">🎯 Simulated Impact</h4>', unsafe_allow_html=True)
-        
-        sim_res_col1, sim_res_col2, sim_res_col3 = st.columns(3)
-        
-        with sim_res_col1:
-            st.metric("Current Footprint", f"{total_emissions} tonnes")
-        
-        with sim_res_col2:
-            st.metric("Simulated Footprint", f"{simulated_total} tonnes", delta=f"-{savings} tonnes")
-        
-        with sim_res_col3:
-            st.metric("Potential Savings", f"{savings_pct}%", delta=f"{savings} tonnes saved")
-        
-        # Savings visualization
-        if savings > 0:
-            comparison_df = pd.DataFrame({
-                "Scenario": ["Current", "With Actions"],
-                "Emissions": [total_emissions, simulated_total]
-            })
-            
-            fig_comparison = px.bar(
-                comparison_df,
-                x="Scenario",
-                y="Emissions",
-                color="Scenario",
-                title="Current vs Optimized Emissions",
-                color_discrete_sequence=['#FF6B6B', '#4ECDC4']
-            )
-            st.plotly_chart(fig_comparison, use_container_width=True)
+        action_simulator(
+            transportation_emissions, electricity_emissions, diet_emissions, waste_emissions,
+            total_emissions, country, diet_type, yearly_waste, diet_keys, diet_index
+        )
 
 with main_tab2:
     st.markdown('<h2 class="section-header">📊 Your History & Trends</h2>', unsafe_allow_html=True)
     
-    calculations = storage.get_calculations()
+    calculations = get_cached_calculations(storage)
     
     if not calculations:
         st.info("📭 No calculation history yet. Complete your first calculation to see trends!")
@@ -545,83 +763,19 @@ with main_tab2:
         # Time series chart
         st.markdown('<h4 class="section-header">📈 Emissions Over Time</h4>', unsafe_allow_html=True)
         
-        df_history = pd.DataFrame(calculations)
-        df_history['date'] = pd.to_datetime(df_history['timestamp']).dt.date
-        df_history = df_history.sort_values('date')
-        
-        fig_timeline = go.Figure()
-        
-        fig_timeline.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['total_emissions'],
-            mode='lines+markers',
-            name='Total Emissions',
-            line=dict(color='#2E8B57', width=3),
-            marker=dict(size=8)
-        ))
-        
-        # Add goal line if exists
+        history_key = (len(calculations), calculations[0].get("timestamp"))
+        df_history = prepare_history_df(history_key, calculations)
+        plot_df = downsample_history(history_key, df_history)
         active_goal = storage.get_active_goal()
-        if active_goal:
-            fig_timeline.add_hline(
-                y=active_goal["target_emissions"],
-                line_dash="dash",
-                line_color="red",
-                annotation_text=f"Goal: {active_goal['target_emissions']} tonnes"
-            )
-        
-        fig_timeline.update_layout(
-            title="Carbon Footprint Timeline",
-            xaxis_title="Date",
-            yaxis_title="Emissions (tonnes CO₂e)",
-            hovermode='x unified'
-        )
+        goal_target = active_goal["target_emissions"] if active_goal else None
+        fig_timeline = build_timeline(history_key, goal_target, plot_df)
         
         st.plotly_chart(fig_timeline, use_container_width=True)
         
         # Category breakdown over time
         st.markdown('<h4 class="section-header">📊 Category Trends</h4>', unsafe_allow_html=True)
         
-        fig_categories = go.Figure()
-        
-        fig_categories.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['transportation'],
-            name='Transportation',
-            stackgroup='one',
-            fillcolor='#2E8B57'
-        ))
-        
-        fig_categories.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['electricity'],
-            name='Electricity',
-            stackgroup='one',
-            fillcolor='#32CD32'
-        ))
-        
-        fig_categories.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['diet'],
-            name='Diet',
-            stackgroup='one',
-            fillcolor='#90EE90'
-        ))
-        
-        fig_categories.add_trace(go.Scatter(
-            x=df_history['date'],
-            y=df_history['waste'],
-            name='Waste',
-            stackgroup='one',
-            fillcolor='#98FB98'
-        ))
-        
-        fig_categories.update_layout(
-            title="Emissions by Category Over Time",
-            xaxis_title="Date",
-            yaxis_title="Emissions (tonnes CO₂e)",
-            hovermode='x unified'
-        )
+        fig_categories = build_category_trends(history_key, plot_df)
         
         st.plotly_chart(fig_categories, use_container_width=True)
         
@@ -634,7 +788,7 @@ with main_tab2:
         st.dataframe(display_df, use_container_width=True, hide_index=True)
         
         # Export history
-        csv_data = display_df.to_csv(index=False)
+        csv_data = history_csv(history_key, display_df)
         st.download_button(
             label="📥 Download History (CSV)",
             data=csv_data,
@@ -646,65 +800,45 @@ with main_tab3:
     st.markdown('<h2 class="section-header">🎯 Scenario Comparison</h2>', unsafe_allow_html=True)
     st.markdown("Compare different lifestyle scenarios side-by-side.")
     
+    high, low = compute_scenarios(country)
+    
     scenario_col1, scenario_col2 = st.columns(2)
     
     with scenario_col1:
         st.markdown('<h4 class="section-header">📊 Scenario A: High Carbon</h4>', unsafe_allow_html=True)
         
-        if country in EMISSION_FACTORS:
-            # High carbon scenario
-            high_transport = EMISSION_FACTORS[country]["Transportation"].get("Car (Petrol)", 0.192) * 50 * 2 * 260 / 1000
-            high_electricity = EMISSION_FACTORS[country]["Electricity"] * 300 * 12 / 1000
-            high_diet = EMISSION_FACTORS[country]["Diet"].get("High Meat Eater", 3300) / 1000
-            high_waste = EMISSION_FACTORS[country]["Waste"] * 10 * 52 * 0.8 / 1000
-            high_total = round(high_transport + high_electricity + high_diet + high_waste, 2)
-            
-            st.metric("Total Emissions", f"{high_total} tonnes")
-            st.markdown(f"""
-            - 🚗 Car commute: 50km/day
-            - 💡 Electricity: 300 kWh/month
-            - 🍽️ High meat diet
-            - 🗑️ 10kg waste/week, 20% recycling
-            """)
-            
-            scenario_a_data = {
-                "Category": ["Transport", "Electricity", "Diet", "Waste"],
-                "Emissions": [high_transport, high_electricity, high_diet, high_waste]
-            }
+        st.metric("Total Emissions", f"{high['total']} tonnes")
+        st.markdown(f"""
+        - 🚗 Car commute: 50km/day
+        - 💡 Electricity: 300 kWh/month
+        - 🍽️ High meat diet
+        - 🗑️ 10kg waste/week, 20% recycling
+        """)
     
     with scenario_col2:
         st.markdown('<h4 class="section-header">🌱 Scenario B: Low Carbon</h4>', unsafe_allow_html=True)
         
-        if country in EMISSION_FACTORS:
-            # Low carbon scenario
-            low_transport = EMISSION_FACTORS[country]["Transportation"].get("Metro/Train", 0.035) * 10 * 2 * 260 / 1000
-            low_electricity = EMISSION_FACTORS[country]["Electricity"] * 80 * 12 / 1000
-            low_diet = EMISSION_FACTORS[country]["Diet"].get("Vegetarian", 1700) / 1000
-            low_waste = EMISSION_FACTORS[country]["Waste"] * 3 * 52 * 0.2 / 1000
-            low_total = round(low_transport + low_electricity + low_diet + low_waste, 2)
-            
-            st.metric("Total Emissions", f"{low_total} tonnes")
-            st.markdown(f"""
-            - 🚲 Metro/bike: 10km/day
-            - 💡 Electricity: 80 kWh/month
-            - 🥗 Vegetarian diet
-            - ♻️ 3kg waste/week, 80% recycling
-            """)
-            
-            scenario_b_data = {
-                "Category": ["Transport", "Electricity", "Diet", "Waste"],
-                "Emissions": [low_transport, low_electricity, low_diet, low_waste]
-            }
+        st.metric("Total Emissions", f"{low['total']} tonnes")
+        st.markdown(f"""
+        - 🚲 Metro/bike: 10km/day
+        - 💡 Electricity: 80 kWh/month
+        - 🥗 Vegetarian diet
+        - ♻️ 3kg waste/week, 80% recycling
+        """)
     
     # Comparison visualization
     st.markdown("---")
     st.markdown('<h4 class="section-header">📊 Side-by-Side Comparison</h4>', unsafe_allow_html=True)
     
+    scenario_keys = ("transport", "electricity", "diet", "waste")
     comparison_data = pd.DataFrame({
-        "Category": ["Transport", "Electricity", "Diet", "Waste"] * 2,
-        "Scenario": ["High Carbon"] * 4 + ["Low Carbon"] * 4,
-        "Emissions": [high_transport, high_electricity, high_diet, high_waste, 
-                     low_transport, low_electricity, low_diet, low_waste]
+        "Category": np.tile(["Transport", "Electricity", "Diet", "Waste"], 2),
+        "Scenario": np.repeat(["High Carbon", "Low Carbon"], 4),
+        "Emissions": np.fromiter(
+            (scenario[key] for scenario in (high, low) for key in scenario_keys),
+            dtype=np.float64,
+            count=8
+        )
     })
     
     fig_scenarios = px.bar(
@@ -720,8 +854,8 @@ with main_tab3:
     st.plotly_chart(fig_scenarios, use_container_width=True)
     
     # Savings calculation
-    savings_amount = round(high_total - low_total, 2)
-    savings_percent = round((savings_amount / high_total) * 100, 1) if high_total > 0 else 0
+    savings_amount = round(high["total"] - low["total"], 2)
+    savings_percent = round((savings_amount / high["total"]) * 100, 1) if high["total"] > 0 else 0
     
     st.success(f"💚 Potential Savings: {savings_amount} tonnes ({savings_percent}% reduction) by switching to a low-carbon lifestyle!")
 
@@ -730,10 +864,12 @@ with main_tab4:
     
     # Get latest calculation for badge checking
     latest_calc = storage.get_latest_calculation()
-    stats = storage.get_statistics()
+    stats = get_cached_stats(storage)
     
     if latest_calc:
-        earned_badges = check_badges(latest_calc, stats)
+        earned_badges = frozenset(check_badges(latest_calc, stats))
+        total_calculations = stats["total_calculations"]
+        current_emissions = latest_calc.get("total_emissions", 999)
         
         st.markdown(f"### You've earned {len(earned_badges)} badge(s)!")
         
@@ -770,14 +906,13 @@ with main_tab4:
         
         with prog_col1:
             if "10_calculations" not in earned_badges:
-                progress_to_10 = min(100, (stats["total_calculations"] / 10) * 100)
+                progress_to_10 = min(100, (total_calculations / 10) * 100)
                 st.markdown("**📊 Tracker Badge**")
                 st.progress(progress_to_10 / 100)
-                st.caption(f"{stats['total_calculations']}/10 calculations completed")
+                st.caption(f"{total_calculations}/10 calculations completed")
         
         with prog_col2:
             if "under_2_tonnes" not in earned_badges:
-                current_emissions = latest_calc.get("total_emissions", 999)
                 if current_emissions > 2:
                     reduction_needed = round(current_emissions - 2, 2)
                     st.markdown("**💚 Climate Champion Badge**")
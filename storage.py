@@ -1,27 +1,248 @@
 """
 Storage module for managing carbon footprint calculation history.
 Handles saving, loading, and retrieving user calculation data.
+
+Calculations are appended to a JSON Lines file, one record per line, so a
+save never rewrites earlier entries. Goals and settings live in a small
+separate JSON file.
 """
 
-import json
+import functools
+import logging
 import os
+import tempfile
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    
+    _loads = orjson.loads
+    
+    def _orjson_default(obj):
+        """Accept float subclasses that the stdlib encoder takes but orjson rejects."""
+        if isinstance(obj, float):
+            return float(obj)
+        raise TypeError
+    
+    def _dump_line(obj) -> bytes:
+        """Encode one JSON Lines record, newline included."""
+        return orjson.dumps(
+            obj, default=_orjson_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+        )
+    
+    def _dump_doc(obj) -> bytes:
+        """Encode a compact JSON document."""
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+    
+    _loads = json.loads
+    
+    def _dump_line(obj) -> bytes:
+        """Encode one JSON Lines record, newline included."""
+        return (json.dumps(obj, separators=(',', ':')) + '\n').encode()
+    
+    def _dump_doc(obj) -> bytes:
+        """Encode a compact JSON document."""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+def _read_file(path: str) -> bytes:
+    """Read a whole file with one os.read sized from fstat, skipping Python's buffered IO."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # A short read only happens if the file grew or the size exceeds one read
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+def _write_temp(path: str, data: bytes) -> str:
+    """Write data to a new uniquely named file next to path and return its name."""
+    fd, tmp_file = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_file, 0o644)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+    return tmp_file
+
+def _publish_file(path: str, data: bytes):
+    """Create path with data unless it already exists, never exposing a partial file."""
+    tmp_file = _write_temp(path, data)
+    try:
+        os.link(tmp_file, path)
+    except FileExistsError:
+        pass
+    except OSError:
+        # No hard links on this filesystem; an exclusive create still never
+        # clobbers another instance's file, at the cost of a brief partial one
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o644)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+    finally:
+        os.unlink(tmp_file)
+
+def _replace_file(path: str, data: bytes):
+    """Atomically replace path with data through a uniquely named temp file."""
+    tmp_file = _write_temp(path, data)
+    try:
+        os.replace(tmp_file, path)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
+
+def _parse_lines(lines: Iterable[bytes]) -> Iterator[Dict]:
+    """Parse complete log lines, logging and skipping any that are not valid JSON."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield _loads(line)
+        except ValueError:
+            logger.warning("Skipping unreadable history line: %r", line.strip()[:80])
+
+def _synchronized(method):
+    """Run a storage method while holding the instance's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# Above this size, statistics for a history that isn't loaded yet are
+# streamed from disk instead of parsing the whole log into memory
+STREAM_THRESHOLD_BYTES = 10 * 1024 * 1024
 
 class CarbonFootprintStorage:
     """Manages persistent storage of carbon footprint calculations."""
     
-    def __init__(self, storage_file: str = "carbon_history.json"):
-        """Initialize storage with file path."""
+    def __init__(self, storage_file: str = "carbon_history.jsonl", meta_file: str = "carbon_meta.json",
+                 stats_file: str = "carbon_stats.json"):
+        """
+        Initialize storage with file paths.
+        
+        Args:
+            storage_file: Append-only JSON Lines file holding one calculation per line.
+                A legacy ".json" history path is accepted too; the ".jsonl" file
+                next to it is used instead and the history is migrated into it
+            meta_file: Small JSON file holding goals and settings
+            stats_file: Cache of the statistics computed for the current storage_file
+        """
+        root, ext = os.path.splitext(storage_file)
+        if ext == ".json":
+            storage_file = root + ".jsonl"
         self.storage_file = storage_file
-        self._ensure_file_exists()
+        self.meta_file = meta_file
+        self.stats_file = stats_file
+        # One instance may be shared by every session thread of a Streamlit
+        # server, so the in-memory state below is only touched under this lock.
+        # Reentrant because some methods call others (save_batch, get_statistics).
+        self._lock = threading.RLock()
+        # Incremented on every successful write; lets callers key caches on it
+        self.version = 0
+        # Parsed calculations and the [st_mtime_ns, st_size] of the log they came from
+        self._calcs = None
+        self._calcs_key = None
+        # Parsed goals/settings and the [st_mtime_ns, st_size] of the meta file;
+        # cached separately so the small meta getters never touch the log
+        self._meta = None
+        self._meta_key = None
+        # Statistics snapshot and the (version, log file stamp) it is current for
+        self._stats = None
+        self._stats_key = None
+        # Nothing is touched on disk here: the files are created when first
+        # found missing and parsed on first use, so a cached get_statistics
+        # can skip them
+    
+    def _stat(self, path: str) -> os.stat_result:
+        """Stat one of the storage files, creating the files if it is missing."""
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            self._ensure_file_exists()
+            return os.stat(path)
+    
+    def _meta_stamp(self) -> List[int]:
+        """Return [st_mtime_ns, st_size] of the meta file."""
+        stat = self._stat(self.meta_file)
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def _refresh_meta(self):
+        """Re-read goals and settings into _meta if the meta file changed on disk."""
+        key = self._meta_stamp()
+        if key != self._meta_key:
+            meta = {"goals": [], "settings": {}}
+            meta.update(_loads(_read_file(self.meta_file)))
+            self._meta = meta
+            self._meta_key = key
+    
+    def _refresh_log(self):
+        """Re-read the calculations into _calcs if the log changed on disk."""
+        stat = self._stat(self.storage_file)
+        key = [stat.st_mtime_ns, stat.st_size]
+        if key != self._calcs_key:
+            # Only parse what existed when the key was taken, and drop a
+            # trailing line another writer is still appending; the key then
+            # no longer matches once that write lands, so it is picked up later
+            log = _read_file(self.storage_file)[:key[1]]
+            log = log[:log.rfind(b'\n') + 1]
+            self._calcs = list(_parse_lines(log.splitlines()))
+            self._calcs_key = key
     
     def _ensure_file_exists(self):
-        """Create storage file if it doesn't exist."""
-        if not os.path.exists(self.storage_file):
-            with open(self.storage_file, 'w') as f:
-                json.dump({"calculations": [], "goals": [], "settings": {}}, f)
+        """
+        Create storage files if they don't exist, migrating a legacy JSON history.
+        
+        Only called once a stat found a file missing, so there is no
+        pre-check here. A legacy history that cannot be parsed is logged and
+        left untouched, and empty files are created so the app keeps
+        working; deleting both new files after fixing it retries the
+        migration. Each file is written in full to a temporary file and then
+        published with os.link, which refuses to replace a file that already
+        exists or another instance created in the meantime.
+        """
+        history = {"calculations": [], "goals": [], "settings": {}}
+        legacy_file = os.path.splitext(self.storage_file)[0] + ".json"
+        try:
+            history.update(_loads(_read_file(legacy_file)))
+        except FileNotFoundError:
+            pass
+        except (TypeError, ValueError):
+            logger.exception("Could not migrate %s; starting with an empty history", legacy_file)
+        
+        # Meta first: an instance that finds the log already present then
+        # builds the same meta payload from the legacy file
+        _publish_file(self.meta_file, _dump_doc({"goals": history["goals"], "settings": history["settings"]}))
+        _publish_file(self.storage_file, b''.join(_dump_line(calc) for calc in history["calculations"]))
+    
+    def _write_meta(self, goals: List[Dict], settings: Dict):
+        """
+        Write goals and settings to the meta file.
+        
+        The data goes to a uniquely named temporary file that is then renamed
+        over the meta file, so a crash mid-write never leaves a truncated file
+        behind and concurrent writers never share a temp file.
+        """
+        _replace_file(self.meta_file, _dump_doc({"goals": goals, "settings": settings}))
     
+    @_synchronized
     def save_calculation(self, data: Dict) -> bool:
         """
         Save a new calculation to history.
@@ -33,30 +254,107 @@ class CarbonFootprintStorage:
             True if saved successfully, False otherwise
         """
         try:
-            history = self.load_history()
+            self._refresh_log()
             
             # Add timestamp if not present
             if "timestamp" not in data:
                 data["timestamp"] = datetime.now().isoformat()
             
-            history["calculations"].append(data)
+            log_key = self._log_key()
+            written = self._append(_dump_line(data))
+            
+            self.version += 1
+            self._after_append([data], log_key, written)
+            return True
+        except Exception:
+            logger.exception("Error saving calculation")
+            return False
+    
+    @_synchronized
+    def save_batch(self, calcs: List[Dict], goal: Optional[Dict] = None) -> bool:
+        """
+        Save several calculations, and optionally a goal, in one go.
+        
+        All calculation lines are joined and appended with a single write.
+        An empty batch touches nothing, and a lone calculation goes through
+        the plain save_calculation path.
+        
+        Args:
+            calcs: Calculation dictionaries to append, oldest first
+            goal: Goal to store as the active goal, if any
+            
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        if goal is None:
+            if not calcs:
+                return True
+            if len(calcs) == 1:
+                return self.save_calculation(calcs[0])
+        
+        try:
+            self._refresh_log()
+            if goal is not None:
+                self._refresh_meta()
+            
+            now = datetime.now().isoformat()
+            for data in calcs:
+                if "timestamp" not in data:
+                    data["timestamp"] = now
+            
+            log_key = self._log_key()
+            written = self._append(b''.join(_dump_line(data) for data in calcs))
             
-            with open(self.storage_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            if goal is not None:
+                if "timestamp" not in goal:
+                    goal["timestamp"] = now
+                self._write_meta([goal], self._meta["settings"])
+                self._meta["goals"] = [goal]
+                self._meta_key = self._meta_stamp()
             
+            self.version += 1
+            self._after_append(calcs, log_key, written)
             return True
-        except Exception as e:
-            print(f"Error saving calculation: {e}")
+        except Exception:
+            logger.exception("Error saving batch")
             return False
     
+    @_synchronized
     def load_history(self) -> Dict:
-        """Load complete history from storage."""
+        """
+        Load complete history from storage.
+        
+        The parsed files are cached and only re-read when their modification
+        time or size changes. Only the top-level containers are copied: the
+        calculation and goal dicts are the cached ones, so callers may add or
+        remove entries but must not modify the records themselves.
+        """
+        meta = self._current_meta()
+        return {
+            "calculations": list(self._current_calcs()),
+            "goals": list(meta["goals"]),
+            "settings": dict(meta["settings"])
+        }
+    
+    @_synchronized
+    def _current_calcs(self) -> List[Dict]:
+        """Return the up-to-date cached calculations list itself; callers must not mutate it."""
+        try:
+            self._refresh_log()
+            return self._calcs
+        except Exception:
+            logger.exception("Error loading history")
+            return []
+    
+    @_synchronized
+    def _current_meta(self) -> Dict:
+        """Return the up-to-date cached goals and settings itself; callers must not mutate it."""
         try:
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading history: {e}")
-            return {"calculations": [], "goals": [], "settings": {}}
+            self._refresh_meta()
+            return self._meta
+        except Exception:
+            logger.exception("Error loading goals and settings")
+            return {"goals": [], "settings": {}}
     
     def get_calculations(self, limit: Optional[int] = None) -> List[Dict]:
         """
@@ -66,82 +364,249 @@ class CarbonFootprintStorage:
             limit: Maximum number of recent calculations to return
             
         Returns:
-            List of calculation dictionaries, most recent first
+            List of calculation dictionaries, most recent first. The list is
+            new, but the dicts are the cached records and must not be mutated
         """
-        history = self.load_history()
-        calculations = history.get("calculations", [])
-        
-        # Sort by timestamp, most recent first
-        calculations.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        calculations = self._current_calcs()
         
+        # Records are appended in chronological order, so reversing the log
+        # gives most recent first without sorting
         if limit:
-            return calculations[:limit]
-        return calculations
+            return calculations[-limit:][::-1]
+        return calculations[::-1]
     
     def get_latest_calculation(self) -> Optional[Dict]:
-        """Get the most recent calculation."""
-        calculations = self.get_calculations(limit=1)
-        return calculations[0] if calculations else None
+        """Get the most recent calculation; it is the cached record, so do not mutate it."""
+        calculations = self._current_calcs()
+        return calculations[-1] if calculations else None
     
+    @_synchronized
     def clear_history(self) -> bool:
         """Clear all calculation history."""
         try:
-            with open(self.storage_file, 'w') as f:
-                json.dump({"calculations": [], "goals": [], "settings": {}}, f)
+            open(self.storage_file, 'wb').close()
+            self._write_meta([], {})
+            self._calcs = []
+            self._calcs_key = self._log_key()
+            self._meta = {"goals": [], "settings": {}}
+            self._meta_key = self._meta_stamp()
+            self.version += 1
+            self._stats = self._build_snapshot([])
+            self._stats_key = (self.version, self._log_key())
             return True
-        except Exception as e:
-            print(f"Error clearing history: {e}")
+        except Exception:
+            logger.exception("Error clearing history")
             return False
     
+    @_synchronized
     def save_goal(self, goal_data: Dict) -> bool:
         """Save a carbon reduction goal."""
         try:
-            history = self.load_history()
+            self._refresh_meta()
             
             if "timestamp" not in goal_data:
                 goal_data["timestamp"] = datetime.now().isoformat()
             
             # Replace existing active goal or add new one
-            history["goals"] = [goal_data]
+            goals = [goal_data]
             
-            with open(self.storage_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            self._write_meta(goals, self._meta["settings"])
             
+            self._meta["goals"] = goals
+            self._meta_key = self._meta_stamp()
+            self.version += 1
             return True
-        except Exception as e:
-            print(f"Error saving goal: {e}")
+        except Exception:
+            logger.exception("Error saving goal")
             return False
     
     def get_active_goal(self) -> Optional[Dict]:
-        """Get the currently active goal."""
-        history = self.load_history()
-        goals = history.get("goals", [])
+        """Get the currently active goal; it is the cached dict, so do not mutate it."""
+        goals = self._current_meta()["goals"]
         return goals[0] if goals else None
     
+    @_synchronized
     def update_settings(self, settings: Dict) -> bool:
         """Update user settings."""
         try:
-            history = self.load_history()
-            history["settings"].update(settings)
+            self._refresh_meta()
+            merged = {**self._meta["settings"], **settings}
             
-            with open(self.storage_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            self._write_meta(self._meta["goals"], merged)
             
+            self._meta["settings"] = merged
+            self._meta_key = self._meta_stamp()
+            self.version += 1
             return True
-        except Exception as e:
-            print(f"Error updating settings: {e}")
+        except Exception:
+            logger.exception("Error updating settings")
             return False
     
     def get_settings(self) -> Dict:
-        """Get user settings."""
-        history = self.load_history()
-        return history.get("settings", {})
+        """Get user settings; this is the cached dict, so do not mutate it (use update_settings)."""
+        return self._current_meta()["settings"]
     
+    @_synchronized
     def get_statistics(self) -> Dict:
-        """Calculate statistics from history."""
-        calculations = self.get_calculations()
+        """
+        Calculate statistics from history.
         
-        if not calculations:
+        Statistics are derived from a snapshot of running totals. The
+        snapshot is kept in memory until the storage version or the
+        calculations file changes, and saves fold new calculations into it
+        directly. It is also kept in stats_file, keyed on the calculations
+        file's mtime and size, so a fresh process does not have to read the
+        whole history again.
+        """
+        file_key = self._log_key()
+        key = (self.version, file_key)
+        if key != self._stats_key:
+            snapshot = self._read_stats_cache(file_key)
+            if snapshot is None:
+                try:
+                    if self._calcs is None and file_key is not None and file_key[1] > STREAM_THRESHOLD_BYTES:
+                        snapshot = self._build_snapshot(self._iter_calculations(file_key[1]))
+                    else:
+                        self._refresh_log()
+                        snapshot = self._build_snapshot(self._calcs)
+                        # The log may have grown since file_key was taken; key the
+                        # snapshot on the stamp the parsed calculations came from
+                        file_key = self._calcs_key
+                        key = (self.version, file_key)
+                except Exception:
+                    # Don't memoize or persist a failed read; retry on the next call
+                    logger.exception("Error reading history for statistics")
+                    return self._format_statistics(self._build_snapshot([]))
+                self._write_stats_cache(file_key, snapshot)
+            self._stats = snapshot
+            self._stats_key = key
+        return self._format_statistics(self._stats)
+    
+    def _log_key(self) -> Optional[List[int]]:
+        """Return [st_mtime_ns, st_size] of the calculations file, or None if it is missing."""
+        try:
+            stat = os.stat(self.storage_file)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def _append(self, data: bytes) -> int:
+        """
+        Append data to the log and return the number of bytes written.
+        
+        If the log ends in a line that was cut short, e.g. by a crash mid-save,
+        it is terminated first so the new records start on a line of their own.
+        """
+        with open(self.storage_file, 'a+b') as f:
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    data = b'\n' + data
+            f.write(data)
+        return len(data)
+    
+    def _after_append(self, calcs: List[Dict], previous_log_key: Optional[List[int]], written: int):
+        """
+        Bring _calcs and the statistics snapshot up to date after appending calcs.
+        
+        Both are only extended in place when they were current for the log
+        as it was before the append and the log grew by exactly the bytes
+        this save wrote. If anything else touched the log in between, they
+        are dropped instead, and the next read rebuilds them from disk.
+        Must be called after self.version has been bumped for the save.
+        """
+        log_key = self._log_key()
+        appended_alone = (
+            previous_log_key is not None and log_key is not None
+            and log_key[1] == previous_log_key[1] + written
+        )
+        
+        if appended_alone and self._calcs_key == previous_log_key:
+            self._calcs.extend(calcs)
+            self._calcs_key = log_key
+        else:
+            self._calcs_key = None
+        
+        if appended_alone and self._stats is not None and self._stats_key == (self.version - 1, previous_log_key):
+            for calc in calcs:
+                self._add_to_snapshot(self._stats, calc)
+            self._stats_key = (self.version, log_key)
+            self._write_stats_cache(log_key, self._stats)
+        else:
+            self._stats = None
+            self._stats_key = None
+    
+    def _iter_calculations(self, size: int) -> Iterator[Dict]:
+        """
+        Yield calculations from the first size bytes of the log, oldest first.
+        
+        Stops at a line that is not yet complete, as _refresh_log does.
+        """
+        with open(self.storage_file, 'rb') as f:
+            yield from _parse_lines(self._complete_lines(f, size))
+    
+    @staticmethod
+    def _complete_lines(f, size: int) -> Iterator[bytes]:
+        """Yield the newline-terminated lines of f that lie within its first size bytes."""
+        remaining = size
+        for line in f:
+            if len(line) > remaining or not line.endswith(b'\n'):
+                break
+            remaining -= len(line)
+            yield line
+    
+    def _read_stats_cache(self, file_key: Optional[List[int]]) -> Optional[Dict]:
+        """Return the cached statistics snapshot if it was built for file_key."""
+        if file_key is None:
+            return None
+        try:
+            cached = _loads(_read_file(self.stats_file))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("key") != file_key:
+            return None
+        return cached.get("snapshot")
+    
+    def _write_stats_cache(self, file_key: Optional[List[int]], snapshot: Dict):
+        """Store the snapshot for file_key; the cache is best-effort, so errors are ignored."""
+        if file_key is None:
+            return
+        try:
+            _replace_file(self.stats_file, _dump_doc({"key": file_key, "snapshot": snapshot}))
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _add_to_snapshot(snapshot: Dict, calc: Dict):
+        """Fold one calculation, newer than all previous ones, into a snapshot."""
+        footprint = calc.get("total_emissions", 0)
+        if not snapshot["count"]:
+            snapshot["lowest"] = snapshot["highest"] = footprint
+            snapshot["first_date"] = calc.get("timestamp", "Unknown")
+        elif footprint < snapshot["lowest"]:
+            snapshot["lowest"] = footprint
+        elif footprint > snapshot["highest"]:
+            snapshot["highest"] = footprint
+        snapshot["count"] += 1
+        snapshot["total"] += footprint
+        snapshot["latest"] = footprint
+        snapshot["latest_date"] = calc.get("timestamp", "Unknown")
+    
+    def _build_snapshot(self, calculations: Iterable[Dict]) -> Dict:
+        """Aggregate chronologically ordered calculations into a snapshot in one pass."""
+        snapshot = {
+            "count": 0, "total": 0, "lowest": 0, "highest": 0, "latest": 0,
+            "first_date": "Unknown", "latest_date": "Unknown"
+        }
+        for calc in calculations:
+            self._add_to_snapshot(snapshot, calc)
+        return snapshot
+    
+    @staticmethod
+    def _format_statistics(snapshot: Dict) -> Dict:
+        """Turn a snapshot of running totals into the public statistics dict."""
+        count = snapshot["count"]
+        if not count:
             return {
                 "total_calculations": 0,
                 "average_footprint": 0,
@@ -150,24 +615,23 @@ class CarbonFootprintStorage:
                 "trend": "neutral"
             }
         
-        footprints = [calc.get("total_emissions", 0) for calc in calculations]
-        
         # Calculate trend (comparing latest vs average of previous)
+        total = snapshot["total"]
+        latest = snapshot["latest"]
         trend = "neutral"
-        if len(footprints) > 1:
-            latest = footprints[0]
-            previous_avg = sum(footprints[1:]) / len(footprints[1:])
+        if count > 1:
+            previous_avg = (total - latest) / (count - 1)
             if latest < previous_avg * 0.95:
                 trend = "improving"
             elif latest > previous_avg * 1.05:
                 trend = "worsening"
         
         return {
-            "total_calculations": len(calculations),
-            "average_footprint": round(sum(footprints) / len(footprints), 2),
-            "lowest_footprint": round(min(footprints), 2),
-            "highest_footprint": round(max(footprints), 2),
+            "total_calculations": count,
+            "average_footprint": round(total / count, 2),
+            "lowest_footprint": round(snapshot["lowest"], 2),
+            "highest_footprint": round(snapshot["highest"], 2),
             "trend": trend,
-            "first_calculation_date": calculations[-1].get("timestamp", "Unknown"),
-            "latest_calculation_date": calculations[0].get("timestamp", "Unknown")
+            "first_calculation_date": snapshot["first_date"],
+            "latest_calculation_date": snapshot["latest_date"]
         }